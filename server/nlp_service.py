@@ -2,10 +2,21 @@ from flask import Flask, request, jsonify
 import pandas as pd
 import numpy as np
 import pdfplumber
+from pdfminer.high_level import extract_text as pdfminer_extract_text
+from pdfminer.layout import LAParams
 import os
+import io
+import hashlib
 import logging
+import queue
+import threading
+import time
+import bisect
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from functools import lru_cache
+import ahocorasick
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -13,10 +24,41 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
+# Micro-batching for model.encode
+BATCH_SIZE = 32
+MAX_WAIT_MS = 20
+
+# Resumes kept by content hash, so re-screening the same file skips extraction and encoding
+RESUME_CACHE_SIZE = 256
+
+# Dynamically quantized ONNX export shipped in the model repo; pick the variant matching the CPU
+ONNX_MODEL_FILE = os.environ.get("ONNX_MODEL_FILE", "onnx/model_quint8_avx2.onnx")
+
 # Global variables
 model = None
+batcher = None
+resume_cache = OrderedDict()
+resume_cache_lock = threading.Lock()
 df = None
 use_bert = False
+use_simsimd = False
+use_numba = False
+
+# SIMD cosine kernels (optional, falls back to NumPy)
+try:
+    import simsimd
+    use_simsimd = True
+except ImportError:
+    logger.warning("simsimd not found. Falling back to NumPy for cosine similarity.")
+    use_simsimd = False
+
+# JIT-compiled skill scanner (optional, falls back to pyahocorasick)
+try:
+    from numba import njit
+    use_numba = True
+except ImportError:
+    logger.warning("numba not found. Falling back to pyahocorasick for skill scanning.")
+    use_numba = False
 
 # Load Dataset
 logger.info("Loading dataset...")
@@ -28,11 +70,32 @@ except Exception as e:
     logger.error(f"Failed to load dataset: {e}")
     df = pd.DataFrame(columns=["job_title", "technical_skills", "soft_skills"])
 
+# Torch intra-op threads: one per physical core rather than per hyperthread, unless overridden
+default_torch_threads = max(1, (os.cpu_count() or 2) // 2)
+torch_threads = default_torch_threads
+if os.environ.get("TORCH_THREADS"):
+    try:
+        torch_threads = int(os.environ["TORCH_THREADS"])
+        if torch_threads < 1:
+            raise ValueError("must be at least 1")
+    except ValueError as e:
+        torch_threads = default_torch_threads
+        logger.warning(f"Invalid TORCH_THREADS={os.environ['TORCH_THREADS']!r} ({e}). Using {torch_threads}.")
+
 # Load Model (Try BERT, fallback to TF-IDF)
 logger.info("Loading NLP model...")
 try:
+    import torch
     from sentence_transformers import SentenceTransformer
-    model = SentenceTransformer("all-MiniLM-L6-v2")
+    # Inference only: no autograd buffers
+    torch.set_num_threads(torch_threads)
+    torch.set_grad_enabled(False)
+    try:
+        model = SentenceTransformer("all-MiniLM-L6-v2", backend="onnx", model_kwargs={"file_name": ONNX_MODEL_FILE})
+        logger.info("Quantized ONNX model loaded successfully.")
+    except Exception as e:
+        logger.warning(f"Failed to load ONNX model: {e}. Falling back to PyTorch.")
+        model = SentenceTransformer("all-MiniLM-L6-v2")
     use_bert = True
     logger.info("BERT model loaded successfully.")
 except ImportError:
@@ -42,18 +105,88 @@ except Exception as e:
     logger.error(f"Failed to load BERT model: {e}. Falling back to TF-IDF.")
     use_bert = False
 
+class EmbeddingBatcher:
+    """Groups concurrent encode requests into a single model.encode call on a worker thread.
+
+    submit() returns a Future resolving to the int8-quantized embedding of the text.
+    """
+
+    def __init__(self, model, batch_size=BATCH_SIZE, max_wait_ms=MAX_WAIT_MS):
+        self.model = model
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, text):
+        future = Future()
+        self.queue.put((text, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            # encode() already sorts by length before padding, so the batch is passed as-is
+            texts = [text for text, _ in batch]
+            try:
+                # Grad mode is thread-local, so the global setting doesn't reach this worker
+                with torch.inference_mode():
+                    embeddings = self.model.encode(texts, batch_size=self.batch_size, convert_to_numpy=True, normalize_embeddings=True)
+            except Exception as e:
+                logger.error(f"Error encoding batch: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), embedding in zip(batch, embeddings):
+                future.set_result(quantize_embedding(embedding))
+
+if use_bert:
+    batcher = EmbeddingBatcher(model)
+
+def quantize_embedding(embedding):
+    # Per-vector scale into int8; cosine is scale-invariant so the factor is dropped
+    scale = 127 / max(float(np.abs(embedding).max()), 1e-12)
+    return np.clip(np.round(embedding * scale), -128, 127).astype(np.int8)
+
+def cosine_score(a, b):
+    """Cosine similarity of two int8-quantized embeddings."""
+    if use_simsimd:
+        return 1.0 - float(simsimd.cosine(a, b, "int8"))
+    a = a.astype(np.float32)
+    b = b.astype(np.float32)
+    return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+
 def get_embeddings(texts):
     if use_bert and model:
         return model.encode(texts)
     else:
-        # Fallback: TF-IDF
+        # Fallback: TF-IDF, left sparse; rows are already L2-normalized
         vectorizer = TfidfVectorizer(stop_words='english')
-        return vectorizer.fit_transform(texts).toarray()
+        return vectorizer.fit_transform(texts)
+
+def extract_text_from_pdf(pdf_bytes):
+    # pdfminer's plain text extraction skips pdfplumber's per-page object model, which substring
+    # matching doesn't need; line grouping is kept so words still get their spaces
+    try:
+        return pdfminer_extract_text(io.BytesIO(pdf_bytes), laparams=LAParams(detect_vertical=False)).lower().strip()
+    except Exception as e:
+        logger.error(f"Error reading PDF with pdfminer: {e}. Falling back to pdfplumber.")
 
-def extract_text_from_pdf(pdf_path):
     text = ""
     try:
-        with pdfplumber.open(pdf_path) as pdf:
+        with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
             for page in pdf.pages:
                 page_text = page.extract_text()
                 if page_text:
@@ -62,42 +195,259 @@ def extract_text_from_pdf(pdf_path):
         logger.error(f"Error reading PDF: {e}")
     return text.lower().strip()
 
+def extract_and_embed(pdf_bytes):
+    """Resume text, its skill term counts and, with BERT, a Future for its quantized embedding.
+
+    Cached by file content hash.
+    """
+    digest = hashlib.sha1(pdf_bytes).hexdigest()
+    with resume_cache_lock:
+        if digest in resume_cache:
+            resume_cache.move_to_end(digest)
+            return resume_cache[digest]
+
+    resume_text = extract_text_from_pdf(pdf_bytes)
+    resume_future = batcher.submit(resume_text) if use_bert else None
+    term_counts, _ = scan_skill_terms(resume_text)
+    # Read-only, since the cached counts are shared between requests
+    term_counts.flags.writeable = False
+
+    with resume_cache_lock:
+        resume_cache[digest] = (resume_text, term_counts, resume_future)
+        if len(resume_cache) > RESUME_CACHE_SIZE:
+            resume_cache.popitem(last=False)
+
+    if resume_future is not None:
+        # Don't serve a failed encode to later uploads of the same file
+        def forget_on_error(future):
+            if future.exception() is not None:
+                with resume_cache_lock:
+                    resume_cache.pop(digest, None)
+        resume_future.add_done_callback(forget_on_error)
+    return resume_text, term_counts, resume_future
+
+@lru_cache(maxsize=1024)
 def get_job_skills(job_role):
     job_role = job_role.lower()
-    filtered = df[df["job_title"].str.contains(job_role, na=False)]
+    # Only distinct titles are scanned; the dataset repeats each title many times
+    titles = np.nonzero(np.char.find(UNIQUE_TITLES, job_role) >= 0)[0]
     
-    if filtered.empty:
-        return [], [], ""
-
-    tech_skills = []
-    soft_skills = []
+    if titles.size == 0:
+        return (), (), ""
 
-    for _, row in filtered.iterrows():
-        tech_skills.extend(str(row["technical_skills"]).split(","))
-        soft_skills.extend(str(row["soft_skills"]).split(","))
-
-    tech_skills = sorted(set(s.strip().lower() for s in tech_skills if s.strip()))
-    soft_skills = sorted(set(s.strip().lower() for s in soft_skills if s.strip()))
+    rows = csr_gather(TITLE_ROWS, TITLE_OFFSETS, titles)
+    # Tuples, since the cached result is shared between requests
+    tech_skills = tuple(ALL_TECH[i] for i in np.unique(csr_gather(TECH_IDS, TECH_OFFSETS, rows)))
+    soft_skills = tuple(ALL_SOFT[i] for i in np.unique(csr_gather(SOFT_IDS, SOFT_OFFSETS, rows)))
 
     job_text = " ".join(tech_skills + soft_skills)
     return tech_skills, soft_skills, job_text
 
-def extract_skills_from_text(text, skill_list):
-    found = []
-    for skill in skill_list:
-        if skill.lower() in text:
-            found.append(skill)
-    return sorted(set(found))
+@lru_cache(maxsize=1024)
+def get_job_embedding(job_role):
+    """Future for the int8-quantized embedding of a role's skill text; already resolved for repeat roles."""
+    _, _, job_text = get_job_skills(job_role)
+    job_future = batcher.submit(job_text)
+    # Don't serve a failed encode to later requests for the role
+    job_future.add_done_callback(lambda future: future.exception() is not None and get_job_embedding.cache_clear())
+    return job_future
+
+def extract_skills_from_text(term_counts, skill_list):
+    # term_counts comes from one scan_skill_terms pass; skill_list is unique and sorted, and so is the result
+    return [skill for skill in skill_list if term_counts[TERM_INDEX[skill]]]
+
+def explode_skills(column):
+    """One lowercased skill per entry from a comma-separated skills column, indexed by row."""
+    skills = df[column].fillna("").astype(str).str.lower().str.split(",").explode().str.strip()
+    return skills[skills != ""]
+
+def split_skills(column):
+    return sorted(set(explode_skills(column)))
 
 def get_all_skills():
-    tech_skills = set()
-    soft_skills = set()
-    for _, row in df.iterrows():
-        tech_skills.update(s.strip().lower() for s in str(row["technical_skills"]).split(","))
-        soft_skills.update(s.strip().lower() for s in str(row["soft_skills"]).split(","))
-    tech_skills.discard("")
-    soft_skills.discard("")
-    return sorted(list(tech_skills)), sorted(list(soft_skills))
+    return split_skills("technical_skills"), split_skills("soft_skills")
+
+def build_skill_offsets(column, vocabulary):
+    """CSR layout of a skills column: flat ids into vocabulary plus per-row offsets."""
+    skill_to_id = {skill: idx for idx, skill in enumerate(vocabulary)}
+    skills = explode_skills(column)
+    ids = skills.map(skill_to_id).to_numpy(dtype=np.int32)
+    row_lengths = np.bincount(skills.index.to_numpy(dtype=np.int64), minlength=len(df))
+    offsets = np.concatenate(([0], np.cumsum(row_lengths)))
+    return ids, offsets
+
+def build_title_index(titles):
+    """Distinct titles plus a CSR layout of the dataset rows carrying each one."""
+    unique_titles, inverse = np.unique(titles, return_inverse=True)
+    rows = np.argsort(inverse, kind="stable")
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(inverse, minlength=len(unique_titles)))))
+    return unique_titles, rows, offsets
+
+def csr_gather(values, offsets, rows):
+    """Concatenated values of the given rows of a CSR layout."""
+    starts = offsets[rows]
+    lengths = offsets[rows + 1] - starts
+    positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+    return values[positions]
+
+def build_skill_automaton(all_skills):
+    # Every skill plus each of its words, so one scan yields both exact and word-level hits
+    terms = list(dict.fromkeys([*all_skills, *(word for skill in all_skills for word in skill.split())]))
+    automaton = ahocorasick.Automaton()
+    for idx, term in enumerate(terms):
+        automaton.add_word(term, (idx, term))
+    automaton.make_automaton()
+    return automaton, {term: idx for idx, term in enumerate(terms)}
+
+def build_term_tables(terms):
+    """Dense Aho-Corasick tables over a compact alphabet of the characters that occur in terms.
+
+    Returns (char_map, delta, term_at, out_link): char_map maps a code point to a symbol
+    (its last entry is the catch-all symbol 0), delta[state, symbol] is the next state with
+    failure links folded in, term_at[state] is the term ending at that state (or -1), and
+    out_link[state] is the nearest proper suffix state where a term ends (or -1).
+    """
+    alphabet = sorted({ch for term in terms for ch in term})
+    char_map = np.zeros(max((ord(ch) for ch in alphabet), default=0) + 2, dtype=np.int32)
+    for symbol, ch in enumerate(alphabet, start=1):
+        char_map[ord(ch)] = symbol
+    n_symbols = len(alphabet) + 1
+
+    goto = [[-1] * n_symbols]
+    term_at = [-1]
+    for idx, term in enumerate(terms):
+        state = 0
+        for ch in term:
+            symbol = char_map[ord(ch)]
+            if goto[state][symbol] < 0:
+                goto[state][symbol] = len(goto)
+                goto.append([-1] * n_symbols)
+                term_at.append(-1)
+            state = goto[state][symbol]
+        term_at[state] = idx
+
+    # Breadth-first so every failure target is complete before its dependents
+    delta = np.zeros((len(goto), n_symbols), dtype=np.int32)
+    fail = [0] * len(goto)
+    out_link = [-1] * len(goto)
+    pending = deque()
+    for symbol, nxt in enumerate(goto[0]):
+        if nxt >= 0:
+            delta[0, symbol] = nxt
+            pending.append(nxt)
+    while pending:
+        state = pending.popleft()
+        f = fail[state]
+        out_link[state] = f if term_at[f] >= 0 else out_link[f]
+        for symbol, nxt in enumerate(goto[state]):
+            if nxt < 0:
+                delta[state, symbol] = delta[f, symbol]
+            else:
+                fail[nxt] = delta[f, symbol]
+                delta[state, symbol] = nxt
+                pending.append(nxt)
+    return char_map, delta, np.array(term_at, dtype=np.int32), np.array(out_link, dtype=np.int32)
+
+def scan_kernel(symbols, delta, term_at, out_link, counts, first_end):
+    state = 0
+    for pos in range(symbols.shape[0]):
+        state = delta[state, symbols[pos]]
+        match = state if term_at[state] >= 0 else out_link[state]
+        while match >= 0:
+            idx = term_at[match]
+            if counts[idx] == 0:
+                first_end[idx] = pos
+            counts[idx] += 1
+            match = out_link[match]
+
+if use_numba:
+    try:
+        scan_kernel = njit(scan_kernel)
+    except Exception as e:
+        logger.error(f"Failed to JIT the skill scanner: {e}. Falling back to pyahocorasick.")
+        use_numba = False
+
+# The dataset is static, so the skill vocabulary and its automaton are built once at startup
+ALL_TECH, ALL_SOFT = get_all_skills()
+ALL_SKILLS = ALL_TECH + ALL_SOFT
+TECH_SET = frozenset(ALL_TECH)
+UNIQUE_TITLES, TITLE_ROWS, TITLE_OFFSETS = build_title_index(df["job_title"].fillna("").astype(str).to_numpy(dtype=str))
+TECH_IDS, TECH_OFFSETS = build_skill_offsets("technical_skills", ALL_TECH)
+SOFT_IDS, SOFT_OFFSETS = build_skill_offsets("soft_skills", ALL_SOFT)
+AUTOMATON, TERM_INDEX = build_skill_automaton(ALL_SKILLS)
+SKILL_TERM_IDS = np.array([TERM_INDEX[skill] for skill in ALL_SKILLS], dtype=np.int64)
+# Flat (owning skill, word term) pairs so word matches sum per skill with one bincount
+WORD_OWNERS = np.array([i for i, skill in enumerate(ALL_SKILLS) for _ in skill.split()], dtype=np.int64)
+WORD_TERM_IDS = np.array([TERM_INDEX[word] for skill in ALL_SKILLS for word in skill.split()], dtype=np.int64)
+
+def scan_skill_terms(text):
+    """Single pass over text: per-term hit counts and the end offset of each term's first hit."""
+    counts = np.zeros(len(TERM_INDEX), dtype=np.int64)
+    first_end = np.full(len(TERM_INDEX), -1, dtype=np.int64)
+    if not TERM_INDEX:
+        return counts, first_end
+    if use_numba:
+        # Code points rather than UTF-8 bytes, so offsets index straight into text
+        codes = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+        symbols = CHAR_MAP[np.minimum(codes, len(CHAR_MAP) - 1)]
+        scan_kernel(symbols, DELTA, TERM_AT, OUT_LINK, counts, first_end)
+        return counts, first_end
+    for end_idx, (idx, _) in AUTOMATON.iter(text):
+        if not counts[idx]:
+            first_end[idx] = end_idx
+        counts[idx] += 1
+    return counts, first_end
+
+# Build the tables and compile the kernel at startup rather than on the first request
+if use_numba:
+    try:
+        CHAR_MAP, DELTA, TERM_AT, OUT_LINK = build_term_tables(list(TERM_INDEX))
+        scan_skill_terms("")
+    except Exception as e:
+        logger.error(f"Failed to compile the skill scanner: {e}. Falling back to pyahocorasick.")
+        use_numba = False
+
+def find_all(text, pattern):
+    """Sorted start offsets of every occurrence of pattern in text."""
+    offsets = []
+    idx = text.find(pattern)
+    while idx >= 0:
+        offsets.append(idx)
+        idx = text.find(pattern, idx + 1)
+    return offsets
+
+@lru_cache(maxsize=128)
+def score_skills(job_desc_lower):
+    """Threshold-independent score per skill in ALL_SKILLS, cached so threshold changes skip rescoring."""
+    counts, first_end = scan_skill_terms(job_desc_lower)
+    if not counts.any():
+        # No skill shares even a word with the description
+        skill_scores = np.zeros(len(ALL_SKILLS))
+        skill_scores.flags.writeable = False
+        return skill_scores
+    
+    exact_counts = counts[SKILL_TERM_IDS]
+    word_matches = np.bincount(WORD_OWNERS, weights=counts[WORD_TERM_IDS], minlength=len(ALL_SKILLS))
+    skill_scores = np.minimum(np.where(exact_counts > 0, 0.7 + (exact_counts * 0.1), word_matches * 0.05), 1.0)
+        
+    # Boost keywords
+    keywords = {'required': 1.2, 'must have': 1.3, 'mandatory': 1.4}
+    keyword_offsets = {k: find_all(job_desc_lower, k) for k in keywords}
+    for i in np.flatnonzero(exact_counts):
+        skill = ALL_SKILLS[i]
+        # A keyword counts if it lies wholly within 50 characters either side of the first mention
+        idx = first_end[SKILL_TERM_IDS[i]] - len(skill) + 1
+        lo, hi = max(0, idx-50), idx+len(skill)+50
+        for k, v in keywords.items():
+            offsets = keyword_offsets[k]
+            pos = bisect.bisect_left(offsets, lo)
+            if pos < len(offsets) and offsets[pos] + len(k) <= hi:
+                skill_scores[i] = min(skill_scores[i] * v, 1.0)
+                break
+
+    # Read-only, since the cached result is shared between requests
+    skill_scores.flags.writeable = False
+    return skill_scores
 
 @app.route('/analyze/resume', methods=['POST'])
 def analyze_resume():
@@ -111,36 +461,31 @@ def analyze_resume():
         if not job_role:
             return jsonify({"error": "No job role provided"}), 400
 
-        # Save temporarily
-        temp_path = f"/tmp/{file.filename}"
-        file.save(temp_path)
-        
-        try:
-            resume_text = extract_text_from_pdf(temp_path)
-        finally:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-
+        job_role = job_role.lower()
         tech_skills, soft_skills, job_text = get_job_skills(job_role)
         
         if not job_text:
             return jsonify({"error": "Job role not found in dataset"}), 404
 
-        resume_tech = extract_skills_from_text(resume_text, tech_skills)
-        resume_soft = extract_skills_from_text(resume_text, soft_skills)
+        resume_text, term_counts, resume_future = extract_and_embed(file.read())
+        # Submit the role text before waiting on either encode, so both can share a batch
+        job_future = get_job_embedding(job_role) if use_bert else None
+
+        resume_tech = extract_skills_from_text(term_counts, tech_skills)
+        resume_soft = extract_skills_from_text(term_counts, soft_skills)
         
-        missing_tech = sorted(list(set(tech_skills) - set(resume_tech)))
-        missing_soft = sorted(list(set(soft_skills) - set(resume_soft)))
+        # Role skills are already sorted, so a frozenset filter keeps them in order without re-sorting
+        found_skills = frozenset(resume_tech + resume_soft)
+        missing_tech = [skill for skill in tech_skills if skill not in found_skills]
+        missing_soft = [skill for skill in soft_skills if skill not in found_skills]
         
         # Calculate similarity
         if use_bert:
-            embeddings = model.encode([resume_text, job_text])
-            score = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
+            score = cosine_score(resume_future.result(), job_future.result())
         else:
-            # Simple TF-IDF similarity for fallback
-            vectorizer = TfidfVectorizer(stop_words='english')
-            tfidf_matrix = vectorizer.fit_transform([resume_text, job_text])
-            score = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
+            # Simple TF-IDF similarity for fallback: a sparse dot product of normalized rows
+            tfidf_matrix = get_embeddings([resume_text, job_text])
+            score = float(tfidf_matrix[0].multiply(tfidf_matrix[1]).sum())
             
         match_score = round(score * 100, 2)
         
@@ -171,46 +516,19 @@ def analyze_jd():
         if not job_description:
             return jsonify({"error": "No description provided"}), 400
 
-        all_tech, all_soft = get_all_skills()
-        all_skills = all_tech + all_soft
-        job_desc_lower = job_description.lower()
-        
-        skill_scores = {}
-        for skill in all_skills:
-            skill_lower = skill.lower()
-            exact_count = job_desc_lower.count(skill_lower)
-            words = skill_lower.split()
-            word_matches = sum(job_desc_lower.count(word) for word in words)
-            
-            if exact_count > 0:
-                score = 0.7 + (exact_count * 0.1)
-            else:
-                score = word_matches * 0.05
-            
-            skill_scores[skill] = min(score, 1.0)
-            
-        # Boost keywords
-        keywords = {'required': 1.2, 'must have': 1.3, 'mandatory': 1.4}
-        for skill in all_skills:
-            if skill.lower() in job_desc_lower:
-                idx = job_desc_lower.find(skill.lower())
-                context = job_desc_lower[max(0, idx-50):min(len(job_desc_lower), idx+len(skill)+50)]
-                for k, v in keywords.items():
-                    if k in context:
-                        skill_scores[skill] = min(skill_scores[skill] * v, 1.0)
-                        break
+        skill_scores = score_skills(job_description.lower())
         
         found_tech = []
         found_soft = []
         
-        for skill in all_skills:
-            score = skill_scores[skill]
-            if score >= threshold * 0.5:
-                item = {"skill": skill, "score": score}
-                if skill in all_tech:
-                    found_tech.append(item)
-                else:
-                    found_soft.append(item)
+        # Only skills clearing the threshold reach the Python loop
+        for i in np.flatnonzero(skill_scores >= threshold * 0.5):
+            skill = ALL_SKILLS[i]
+            item = {"skill": skill, "score": float(skill_scores[i])}
+            if skill in TECH_SET:
+                found_tech.append(item)
+            else:
+                found_soft.append(item)
                     
         found_tech.sort(key=lambda x: x['score'], reverse=True)
         found_soft.sort(key=lambda x: x['score'], reverse=True)